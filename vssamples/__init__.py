@@ -1,3 +1,4 @@
+from .artifacts import *
 from .colorbars import *
 from .enums import *
 from .gradient import *
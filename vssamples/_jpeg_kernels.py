@@ -0,0 +1,213 @@
+"""Numba kernels for the block artifact generators.
+
+Numba is optional; when it is missing ``process_plane_nb`` is None and the
+callers fall back to the batched NumPy path.
+"""
+import numpy as np
+
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+
+# AA&N row/column scale factors; the forward flowgraph produces coefficients
+# scaled by 2*sqrt(2)*cos(u*pi/16)*sqrt(2) relative to the orthonormal DCT,
+# so the quantization step folds these back in
+_AAN_SCALE = 2.0 * np.sqrt(2.0) * np.array(
+    [1.0, 1.387039845, 1.306562965, 1.175875602, 1.0, 0.785694958, 0.541196100, 0.275899379],
+    dtype=np.float32,
+)
+_AAN_2D = np.outer(_AAN_SCALE, _AAN_SCALE).astype(np.float32)
+_INV_AAN_2D = (1.0 / _AAN_2D).astype(np.float32)
+_AAN_2D_64 = (_AAN_2D / 64.0).astype(np.float32)
+
+if njit is not None:
+
+    @njit(nogil=True, fastmath=True, cache=True)
+    def _fdct8(d):
+        tmp0 = d[0] + d[7]; tmp7 = d[0] - d[7]
+        tmp1 = d[1] + d[6]; tmp6 = d[1] - d[6]
+        tmp2 = d[2] + d[5]; tmp5 = d[2] - d[5]
+        tmp3 = d[3] + d[4]; tmp4 = d[3] - d[4]
+
+        tmp10 = tmp0 + tmp3; tmp13 = tmp0 - tmp3
+        tmp11 = tmp1 + tmp2; tmp12 = tmp1 - tmp2
+        d[0] = tmp10 + tmp11
+        d[4] = tmp10 - tmp11
+        z1 = (tmp12 + tmp13) * 0.707106781
+        d[2] = tmp13 + z1
+        d[6] = tmp13 - z1
+
+        tmp10 = tmp4 + tmp5; tmp11 = tmp5 + tmp6; tmp12 = tmp6 + tmp7
+        z5 = (tmp10 - tmp12) * 0.382683433
+        z2 = 0.541196100 * tmp10 + z5
+        z4 = 1.306562965 * tmp12 + z5
+        z3 = tmp11 * 0.707106781
+        z11 = tmp7 + z3
+        z13 = tmp7 - z3
+        d[5] = z13 + z2
+        d[3] = z13 - z2
+        d[1] = z11 + z4
+        d[7] = z11 - z4
+
+    @njit(nogil=True, fastmath=True, cache=True)
+    def _idct8(d):
+        tmp10 = d[0] + d[4]
+        tmp11 = d[0] - d[4]
+        tmp13 = d[2] + d[6]
+        tmp12 = (d[2] - d[6]) * 1.414213562 - tmp13
+        tmp0 = tmp10 + tmp13
+        tmp3 = tmp10 - tmp13
+        tmp1 = tmp11 + tmp12
+        tmp2 = tmp11 - tmp12
+
+        z13 = d[5] + d[3]; z10 = d[5] - d[3]
+        z11 = d[1] + d[7]; z12 = d[1] - d[7]
+        tmp7 = z11 + z13
+        tmp11 = (z11 - z13) * 1.414213562
+        z5 = (z10 + z12) * 1.847759065
+        tmp10 = 1.082392200 * z12 - z5
+        tmp12 = -2.613125930 * z10 + z5
+        tmp6 = tmp12 - tmp7
+        tmp5 = tmp11 - tmp6
+        tmp4 = tmp10 + tmp5
+
+        d[0] = tmp0 + tmp7
+        d[7] = tmp0 - tmp7
+        d[1] = tmp1 + tmp6
+        d[6] = tmp1 - tmp6
+        d[2] = tmp2 + tmp5
+        d[5] = tmp2 - tmp5
+        d[4] = tmp3 + tmp4
+        d[3] = tmp3 - tmp4
+
+    @njit(nogil=True, fastmath=True, cache=True)
+    def _process_block8(plane, out, r, c, q_table, inv_q,
+                        in_scale, in_offset, out_scale, out_offset, lo, hi, integer_out):
+        blk = np.empty((8, 8), dtype=np.float32)
+        col = np.empty(8, dtype=np.float32)
+
+        for i in range(8):
+            for j in range(8):
+                blk[i, j] = plane[r + i, c + j] * in_scale + in_offset
+
+        for i in range(8):
+            _fdct8(blk[i])
+        for j in range(8):
+            for i in range(8):
+                col[i] = blk[i, j]
+            _fdct8(col)
+            for i in range(8):
+                blk[i, j] = col[i]
+
+        # q_table/inv_q arrive with the AA&N scale factors already folded in
+        for i in range(8):
+            for j in range(8):
+                blk[i, j] = round(blk[i, j] * inv_q[i, j]) * q_table[i, j]
+
+        for i in range(8):
+            _idct8(blk[i])
+        for j in range(8):
+            for i in range(8):
+                col[i] = blk[i, j]
+            _idct8(col)
+            for i in range(8):
+                blk[i, j] = col[i]
+
+        for i in range(8):
+            for j in range(8):
+                v = (blk[i, j] + 128.0) * out_scale + out_offset
+                if integer_out:
+                    v = round(v)
+                out[r + i, c + j] = min(max(v, lo), hi)
+
+    @njit(nogil=True, fastmath=True, cache=True)
+    def _process_block(plane, out, r, c, dct, q_table, inv_q,
+                       in_scale, in_offset, out_scale, out_offset, lo, hi, integer_out):
+        n = dct.shape[0]
+        tmp = np.zeros((n, n), dtype=np.float32)
+        coef = np.empty((n, n), dtype=np.float32)
+        row = np.empty(n, dtype=np.float32)
+
+        # coef = dct @ (block * in_scale + in_offset) @ dct.T
+        # i-k-j ordering keeps the innermost loop contiguous so LLVM can vectorize it
+        for i in range(n):
+            for k in range(n):
+                a = dct[i, k]
+                for j in range(n):
+                    tmp[i, j] += a * (plane[r + k, c + j] * in_scale + in_offset)
+        for i in range(n):
+            for j in range(n):
+                acc = 0.0
+                for k in range(n):
+                    acc += tmp[i, k] * dct[j, k]
+                coef[i, j] = round(acc * inv_q[i, j]) * q_table[i, j]
+
+        # block = dct.T @ coef @ dct, rescaled/clipped on the fly at the write
+        for i in range(n):
+            for j in range(n):
+                tmp[i, j] = 0.0
+        for i in range(n):
+            for k in range(n):
+                a = dct[k, i]
+                for j in range(n):
+                    tmp[i, j] += a * coef[k, j]
+        for i in range(n):
+            for j in range(n):
+                row[j] = 0.0
+            for k in range(n):
+                a = tmp[i, k]
+                for j in range(n):
+                    row[j] += a * dct[k, j]
+            for j in range(n):
+                v = (row[j] + 128.0) * out_scale + out_offset
+                if integer_out:
+                    v = round(v)
+                out[r + i, c + j] = min(max(v, lo), hi)
+
+    @njit(parallel=True, nogil=True, fastmath=True, cache=True)
+    def process_plane8_nb(plane, q_table, inv_q, out,
+                          in_scale, in_offset, out_scale, out_offset, lo, hi, integer_out):
+        """Uniform 8x8 grid over a whole padded plane, for JpegArtifacts."""
+        q_aan = (q_table * _AAN_2D_64).astype(np.float32)
+        iq_aan = (inv_q * _INV_AAN_2D).astype(np.float32)
+        nby = plane.shape[0] // 8
+        for by in prange(nby):
+            r = by * 8
+            for c in range(0, plane.shape[1], 8):
+                _process_block8(plane, out, r, c, q_aan, iq_aan,
+                                in_scale, in_offset, out_scale, out_offset, lo, hi, integer_out)
+
+    @njit(parallel=True, nogil=True, fastmath=True, cache=True)
+    def process_plane_nb(plane, bs_map, dct4, q4, iq4, dct8, q8, iq8, dct16, q16, iq16, out,
+                         in_scale, in_offset, out_scale, out_offset, lo, hi, integer_out):
+        nby, nbx = bs_map.shape
+        mbs = plane.shape[0] // nby
+        # fold the AA&N scale into the 8x8 tables once per plane, not per block
+        q8_aan = (q8 * _AAN_2D_64).astype(np.float32)
+        iq8_aan = (iq8 * _INV_AAN_2D).astype(np.float32)
+
+        for by in prange(nby):
+            for bx in range(nbx):
+                bs = bs_map[by, bx]
+                if bs == 8:
+                    # separable AA&N fast path; 4x4 and 16x16 keep the general matmul
+                    for sy in range(0, mbs, 8):
+                        for sx in range(0, mbs, 8):
+                            _process_block8(plane, out, by * mbs + sy, bx * mbs + sx, q8_aan, iq8_aan,
+                                            in_scale, in_offset, out_scale, out_offset, lo, hi, integer_out)
+                    continue
+
+                if bs == 4:
+                    dct, q_table, inv_q = dct4, q4, iq4
+                else:
+                    dct, q_table, inv_q = dct16, q16, iq16
+
+                for sy in range(0, mbs, bs):
+                    for sx in range(0, mbs, bs):
+                        _process_block(plane, out, by * mbs + sy, bx * mbs + sx, dct, q_table, inv_q,
+                                       in_scale, in_offset, out_scale, out_offset, lo, hi, integer_out)
+
+else:
+    process_plane_nb = None
+    process_plane8_nb = None
@@ -0,0 +1,629 @@
+from concurrent.futures import ThreadPoolExecutor
+from enum import IntEnum
+import threading
+
+import numpy as np
+import vapoursynth as vs
+from scipy.ndimage import zoom
+
+from ._jpeg_kernels import process_plane8_nb, process_plane_nb
+
+try:
+    import cupy as cp
+except ImportError:
+    cp = None
+
+try:
+    import numexpr as ne
+except ImportError:
+    ne = None
+
+if cp is not None:
+    # quant/dequant as one fused elementwise pass instead of three kernels
+    _gpu_quant = cp.ElementwiseKernel(
+        "float32 d, float32 q, float32 iq", "float32 o",
+        "o = nearbyintf(d * iq) * q", "jpeg_quant",
+    )
+
+core = vs.core
+
+LUMA_QUANT_TABLE = np.array([
+    [16, 11, 10, 16, 24, 40, 51, 61],
+    [12, 12, 14, 19, 26, 58, 60, 55],
+    [14, 13, 16, 24, 40, 57, 69, 56],
+    [14, 17, 22, 29, 51, 87, 80, 62],
+    [18, 22, 37, 56, 68, 109, 103, 77],
+    [24, 35, 55, 64, 81, 104, 113, 92],
+    [49, 64, 78, 87, 103, 121, 120, 101],
+    [72, 92, 95, 98, 112, 100, 103, 99],
+], dtype=np.float32)
+"""ITU-T T.81 Annex K.1 luminance quantization table"""
+
+CHROMA_QUANT_TABLE = np.array([
+    [17, 18, 24, 47, 99, 99, 99, 99],
+    [18, 21, 26, 66, 99, 99, 99, 99],
+    [24, 26, 56, 99, 99, 99, 99, 99],
+    [47, 66, 99, 99, 99, 99, 99, 99],
+    [99, 99, 99, 99, 99, 99, 99, 99],
+    [99, 99, 99, 99, 99, 99, 99, 99],
+    [99, 99, 99, 99, 99, 99, 99, 99],
+    [99, 99, 99, 99, 99, 99, 99, 99],
+], dtype=np.float32)
+"""ITU-T T.81 Annex K.2 chrominance quantization table"""
+
+
+def get_dct_matrix(n: int) -> np.ndarray:
+    """n-point DCT-II basis matrix. The inverse transform is its transpose."""
+    i = np.arange(n, dtype=np.float32)[:, None]
+    j = np.arange(n, dtype=np.float32)[None, :]
+    matrix = np.sqrt(np.float32(2.0 / n)) * np.cos((2 * j + 1) * i * (np.pi / (2 * n)))
+    matrix[0, :] = 1.0 / np.sqrt(n)
+    return matrix.astype(np.float32)
+
+
+def resize_quant_table(table: np.ndarray, size: int) -> np.ndarray:
+    """Resample an 8x8 quantization table to size x size with a cubic spline."""
+    if size == table.shape[0]:
+        return table
+    return zoom(table, size / table.shape[0], order=3).astype(np.float32)
+
+
+def get_scaled_quant_table(table: np.ndarray, quality: int) -> np.ndarray:
+    """Scale a quantization table for a quality setting in [1, 100], IJG style."""
+    if quality < 50:
+        scale = 5000 // quality
+    else:
+        scale = 200 - 2 * quality
+
+    # values fit in [1, 255]; int16 keeps the tables small enough to sit in L1
+    return np.clip((table.astype(np.int32) * scale + 50) // 100, 1, 255).astype(np.int16)
+
+
+DCT_MATRIX = get_dct_matrix(8)
+IDCT_MATRIX = np.ascontiguousarray(DCT_MATRIX.T)
+
+LUMA_QUANT_TABLES = {size: resize_quant_table(LUMA_QUANT_TABLE, size) for size in (4, 8, 16)}
+CHROMA_QUANT_TABLES = {size: resize_quant_table(CHROMA_QUANT_TABLE, size) for size in (4, 8, 16)}
+
+# placeholders for transform sizes an instance was not configured with; numba
+# unifies each table argument trio statically, so these must match the real
+# tables' dtypes (int16 quant, float32 reciprocal) even though they are never
+# read at runtime
+_UNUSED_Q_TABLE = LUMA_QUANT_TABLE.astype(np.int16)
+_UNUSED_INV_Q_TABLE = LUMA_QUANT_TABLE
+
+
+class BlockSize(IntEnum):
+    SMALL = 4
+    MEDIUM = 8
+    LARGE = 16
+
+
+class JpegArtifacts:
+    """
+    JPEG-style compression artifact generator.
+
+    Each plane is split into 8x8 blocks which are DCT transformed, quantized
+    with the ITU-T T.81 example tables scaled for the given quality, and
+    transformed back. Lower quality means coarser quantization, i.e. more
+    blocking and ringing. Values are processed in JPEG's 8-bit [0, 255] range
+    regardless of the clip's bit depth.
+    """
+
+    def __init__(self, quality: int = 50, use_gpu: bool | None = None):
+        self.quality = quality
+        self.luma_q_table = get_scaled_quant_table(LUMA_QUANT_TABLE, quality)
+        self.chroma_q_table = get_scaled_quant_table(CHROMA_QUANT_TABLE, quality)
+        # division is far slower than multiplication and the tables never change
+        self.inv_luma_q_table = (1.0 / self.luma_q_table).astype(np.float32)
+        self.inv_chroma_q_table = (1.0 / self.chroma_q_table).astype(np.float32)
+        # table stacks for the batched three-plane path
+        self._q_stack = np.stack([self.luma_q_table, self.chroma_q_table, self.chroma_q_table])
+        self._inv_q_stack = np.stack([self.inv_luma_q_table, self.inv_chroma_q_table, self.inv_chroma_q_table])
+        self.use_gpu = cp is not None and cp.cuda.is_available() if use_gpu is None else use_gpu
+        self._gpu_cache: dict[int, object] = {}
+        self._scratch = threading.local()
+
+    def _scratch_plane(self, shape: tuple[int, int]) -> np.ndarray:
+        """A reusable float32 buffer for a plane of the given shape.
+
+        ModifyFrame can run the selector from several worker threads at once,
+        so the buffers are kept per thread; this avoids reallocating three
+        plane-sized arrays per frame.
+        """
+        cache = getattr(self._scratch, "planes", None)
+        if cache is None:
+            cache = self._scratch.planes = {}
+        buf = cache.get(shape)
+        if buf is None:
+            buf = cache[shape] = np.empty(shape, np.float32)
+        return buf
+
+    def _to_gpu(self, arr: np.ndarray):
+        cached = self._gpu_cache.get(id(arr))
+        if cached is None:
+            cached = self._gpu_cache[id(arr)] = cp.asarray(np.ascontiguousarray(arr, dtype=np.float32))
+        return cached
+
+    def _process_plane(
+        self,
+        planes: np.ndarray,
+        q_table: np.ndarray,
+        inv_q_table: np.ndarray,
+        *,
+        in_scale: float = 1.0,
+        in_offset: float = -128.0,
+        out_scale: float = 1.0,
+        out_offset: float = 0.0,
+        lo: float = 0.0,
+        hi: float = 255.0,
+        integer_out: bool = False,
+    ) -> np.ndarray:
+        """Run the block transform over a plane, or a (3, h, w) stack of planes
+        with a matching (3, 8, 8) table stack.
+
+        The affine transforms into JPEG's centered [-128, 127] range and back
+        (including the final clip and optional round) are fused into the block
+        pass so no full-plane temporaries are materialized.
+        """
+        h, w = planes.shape[-2:]
+        ph = -(-h // 8) * 8
+        pw = -(-w // 8) * 8
+        lead = planes.shape[:-2]
+
+        if (ph, pw) == (h, w):
+            padded = planes
+        else:
+            # np.pad allocates and runs a generic fill every call; slice
+            # assignment into a cached buffer replicates the edge directly
+            padded = self._scratch_plane(lead + (ph, pw))
+            padded[..., :h, :w] = planes
+            padded[..., h:, :w] = padded[..., h - 1:h, :w]
+            padded[..., :, w:] = padded[..., :, w - 1:w]
+
+        if self.use_gpu:
+            dct = self._to_gpu(DCT_MATRIX)
+            idct = self._to_gpu(IDCT_MATRIX)
+            centered = cp.asarray(padded) * cp.float32(in_scale) + cp.float32(in_offset)
+            tiles = centered.reshape(*lead, ph // 8, 8, pw // 8, 8)
+            dct_tiles = cp.einsum('ij,...jxk,kl->...ixl', dct, tiles, idct)
+            dequant_tiles = _gpu_quant(
+                dct_tiles,
+                self._to_gpu(q_table)[..., None, :, None, :],
+                self._to_gpu(inv_q_table)[..., None, :, None, :],
+            )
+            idct_tiles = cp.einsum('ij,...ixl,kl->...jxk', dct, dequant_tiles, idct)
+            out = cp.clip(
+                (idct_tiles.reshape(*lead, ph, pw) + 128.0) * cp.float32(out_scale) + cp.float32(out_offset),
+                lo, hi,
+            )
+            if integer_out:
+                out = cp.rint(out)
+            return cp.asnumpy(out[..., :h, :w])
+
+        if process_plane8_nb is not None:
+            out = np.empty_like(padded)
+            if padded.ndim == 2:
+                process_plane8_nb(padded, q_table, inv_q_table, out,
+                                  in_scale, in_offset, out_scale, out_offset, lo, hi, integer_out)
+            else:
+                for p in range(padded.shape[0]):
+                    process_plane8_nb(padded[p], q_table[p], inv_q_table[p], out[p],
+                                      in_scale, in_offset, out_scale, out_offset, lo, hi, integer_out)
+            return out[..., :h, :w]
+
+        # einsum over the untransposed (..., y, 8, x, 8) view fuses the block
+        # gather with the matmuls, so no frame-sized transpose copies remain
+        padded *= np.float32(in_scale)
+        padded += np.float32(in_offset)
+        blocks = padded.reshape(*lead, ph // 8, 8, pw // 8, 8)
+        dct_blocks = np.einsum('ij,...jxk,kl->...ixl', DCT_MATRIX, blocks, IDCT_MATRIX, optimize=True)
+        # round(dct / q) * q, as a multiply and with no int32 round-trip;
+        # the rounding already discretizes the coefficients
+        inv_qb = inv_q_table[..., None, :, None, :]
+        qb = q_table[..., None, :, None, :]
+        if ne is not None:
+            # numexpr fuses the whole expression into one threaded pass
+            dequant_blocks = ne.evaluate(
+                "where(d >= 0, floor(d * iq + 0.5), -floor(-d * iq + 0.5)) * q",
+                local_dict={"d": dct_blocks, "iq": inv_qb, "q": qb},
+            )
+        else:
+            dequant_blocks = np.round(dct_blocks * inv_qb) * qb
+        idct_blocks = np.einsum('ij,...ixl,kl->...jxk', DCT_MATRIX, dequant_blocks, IDCT_MATRIX, optimize=True)
+
+        out = idct_blocks.reshape(*lead, ph, pw)
+        out += 128.0
+        out *= np.float32(out_scale)
+        out += np.float32(out_offset)
+        np.clip(out, lo, hi, out=out)
+        if integer_out:
+            np.rint(out, out=out)
+        return out[..., :h, :w]
+
+    def _can_stack(self, f: vs.VideoFrame) -> bool:
+        return f.format.num_planes == 3 and f.format.subsampling_w == 0 and f.format.subsampling_h == 0
+
+    def _process_frame_int(self, n: int, f: vs.VideoFrame) -> vs.VideoFrame:
+        fout = f.copy()
+
+        max_val = (1 << f.format.bits_per_sample) - 1
+        scale_factor = max_val / 255.0
+
+        if self._can_stack(f):
+            # one batched transform over all three planes amortizes dispatch
+            stack = self._scratch_plane((3,) + np.asarray(f[0]).shape)
+            for i in range(3):
+                np.copyto(stack[i], np.asarray(f[i]))
+            processed = self._process_plane(
+                stack, self._q_stack, self._inv_q_stack,
+                in_scale=1.0 / scale_factor, out_scale=scale_factor,
+                hi=max_val, integer_out=True,
+            )
+            for i in range(3):
+                np.copyto(np.asarray(fout[i]), processed[i], casting="unsafe")
+            return fout
+
+        for i in range(fout.format.num_planes):
+            plane = np.asarray(f[i])
+            luma = i == 0
+            q_table = self.luma_q_table if luma else self.chroma_q_table
+            inv_q_table = self.inv_luma_q_table if luma else self.inv_chroma_q_table
+
+            plane_float = self._scratch_plane(plane.shape)
+            np.copyto(plane_float, plane)
+            processed_plane = self._process_plane(
+                plane_float, q_table, inv_q_table,
+                in_scale=1.0 / scale_factor, out_scale=scale_factor,
+                hi=max_val, integer_out=True,
+            )
+
+            # the plane views are zero-copy; cast on the way into the output
+            # frame instead of staging another astype copy
+            np.copyto(np.asarray(fout[i]), processed_plane, casting="unsafe")
+
+        return fout
+
+    def _process_frame_float(self, n: int, f: vs.VideoFrame) -> vs.VideoFrame:
+        fout = f.copy()
+
+        if self._can_stack(f):
+            # the per-plane chroma offset cannot be folded into the scalar
+            # affine, so it is applied as one pass either side of the batch
+            chroma_offset = 0.5 if f.format.color_family is vs.YUV else 0.0
+            offsets = np.array([0.0, chroma_offset, chroma_offset], np.float32)[:, None, None]
+            stack = self._scratch_plane((3,) + np.asarray(f[0]).shape)
+            for i in range(3):
+                np.copyto(stack[i], np.asarray(f[i]))
+            stack += offsets
+            processed = self._process_plane(
+                stack, self._q_stack, self._inv_q_stack,
+                in_scale=255.0, out_scale=1.0 / 255.0, lo=0.0, hi=1.0,
+            )
+            np.subtract(processed, offsets, out=processed)
+            for i in range(3):
+                np.copyto(np.asarray(fout[i]), processed[i])
+            return fout
+
+        for i in range(fout.format.num_planes):
+            plane = np.asarray(f[i])
+            luma = i == 0
+            q_table = self.luma_q_table if luma else self.chroma_q_table
+            inv_q_table = self.inv_luma_q_table if luma else self.inv_chroma_q_table
+            chroma = f.format.color_family is vs.YUV and i > 0
+            offset = 0.5 if chroma else 0.0
+
+            plane_float = self._scratch_plane(plane.shape)
+            np.copyto(plane_float, plane)
+            processed_plane = self._process_plane(
+                plane_float, q_table, inv_q_table,
+                in_scale=255.0, in_offset=offset * 255.0 - 128.0,
+                out_scale=1.0 / 255.0, out_offset=-offset,
+                lo=0.0 - offset, hi=1.0 - offset,
+            )
+
+            np.copyto(np.asarray(fout[i]), processed_plane)
+
+        return fout
+
+    def apply(self, clip: vs.VideoNode) -> vs.VideoNode:
+        if clip.format.sample_type is vs.FLOAT:
+            selector = self._process_frame_float
+        else:
+            selector = self._process_frame_int
+
+        return clip.std.ModifyFrame(clips=clip, selector=selector)
+
+
+class AvcBlockJpeg(JpegArtifacts):
+    """
+    AVC-style variable block size quantization artifacts.
+
+    The plane is split into macroblocks which are transformed with a 4x4, 8x8
+    or 16x16 DCT. The transform size per macroblock is driven by a simple
+    temporal motion mask: still regions get the large transform, moving
+    regions the small one, mimicking an encoder's partitioning decisions.
+    Without a mask the block size is picked at random per macroblock.
+    """
+
+    def __init__(
+        self,
+        quality: int = 50,
+        block_sizes: tuple[BlockSize, ...] = (BlockSize.SMALL, BlockSize.MEDIUM, BlockSize.LARGE),
+        motion_thresholds: tuple[float, ...] = (0.1, 0.3),
+        use_gpu: bool | None = None,
+    ):
+        super().__init__(quality, use_gpu)
+        self.block_sizes = tuple(sorted(block_sizes))
+        self.motion_thresholds = tuple(motion_thresholds)
+        # the plane jobs run concurrently and np.random.Generator is not
+        # thread-safe, so each worker thread gets its own generator spawned
+        # from one seed sequence on first use
+        self._seed_seq = np.random.SeedSequence()
+        self._seed_lock = threading.Lock()
+        self._rng_local = threading.local()
+        # the three planes are independent and the heavy work releases the GIL
+        self._pool = ThreadPoolExecutor(max_workers=3)
+
+        # plain ints; the hot path never touches the enum again
+        self._bs_vals = tuple(bs.value for bs in self.block_sizes)
+        self._macro_block_size = self._bs_vals[-1]
+
+        self.dct_matrices = {bs: get_dct_matrix(bs) for bs in self._bs_vals}
+        self.luma_q_tables = {
+            bs: get_scaled_quant_table(LUMA_QUANT_TABLES[bs], quality)
+            for bs in self._bs_vals
+        }
+        self.chroma_q_tables = {
+            bs: get_scaled_quant_table(CHROMA_QUANT_TABLES[bs], quality)
+            for bs in self._bs_vals
+        }
+        # division is far slower than multiplication and the tables never change
+        self.inv_luma_q_tables = {bs: (1.0 / t).astype(np.float32) for bs, t in self.luma_q_tables.items()}
+        self.inv_chroma_q_tables = {bs: (1.0 / t).astype(np.float32) for bs, t in self.chroma_q_tables.items()}
+
+    def _motion_mask(self, clip: vs.VideoNode) -> vs.VideoNode:
+        # only plane 0 of the mask is ever read, so don't spend Expr time on chroma
+        y = core.std.ShufflePlanes(clip, 0, vs.GRAY)
+        self.offset_fwd = y[1:] + y[-1]
+        self.offset_bwd = y[0] + y[:-1]
+        return core.akarin.Expr(
+            [y, self.offset_fwd, self.offset_bwd],
+            "x y - abs x z - abs max 10 *"
+        )
+
+    def _block_size_map(self, mask_macro: np.ndarray | None, nby: int, nbx: int) -> np.ndarray:
+        """Per-macroblock block size values, either from motion averages or random."""
+        if mask_macro is None:
+            rng = getattr(self._rng_local, "rng", None)
+            if rng is None:
+                with self._seed_lock:
+                    rng = np.random.default_rng(self._seed_seq.spawn(1)[0])
+                self._rng_local.rng = rng
+            return rng.choice(np.asarray(self._bs_vals), size=(nby, nbx))
+
+        # still areas get the big lazy transform, busy areas the small one
+        sizes = np.asarray(self._bs_vals[::-1])
+        thresholds = np.asarray(self.motion_thresholds, dtype=np.float32)
+        idx = np.searchsorted(thresholds, mask_macro, side="left")
+        return sizes[np.minimum(idx, len(sizes) - 1)]
+
+    def _process_plane(  # type: ignore[override]
+        self,
+        plane: np.ndarray,
+        q_tables: dict[int, np.ndarray],
+        inv_q_tables: dict[int, np.ndarray],
+        mask_plane: np.ndarray | None = None,
+        *,
+        in_scale: float = 1.0,
+        in_offset: float = -128.0,
+        out_scale: float = 1.0,
+        out_offset: float = 0.0,
+        lo: float = 0.0,
+        hi: float = 255.0,
+        integer_out: bool = False,
+    ) -> np.ndarray:
+        """
+        Run the block transform over a raw plane.
+
+        The input/output affine transforms (clip range to JPEG's centered
+        [-128, 127] range and back, including the final clip and optional
+        round) are fused into the block pass so no full-plane temporaries
+        are materialized.
+        """
+        macro_block_size = self._macro_block_size
+        h, w = plane.shape
+        ph = -(-h // macro_block_size) * macro_block_size
+        pw = -(-w // macro_block_size) * macro_block_size
+        plane_padded = np.pad(plane, ((0, ph - h), (0, pw - w)), mode="edge")
+        nby = ph // macro_block_size
+        nbx = pw // macro_block_size
+
+        mask_macro = None
+        if mask_plane is not None:
+            mask_padded = np.pad(mask_plane, ((0, ph - h), (0, pw - w)), mode="edge")
+            mask_macro = mask_padded.reshape(nby, macro_block_size, nbx, macro_block_size).mean(axis=(1, 3))
+
+        bs_map = self._block_size_map(mask_macro, nby, nbx)
+
+        if self.use_gpu:
+            return self._process_plane_gpu(
+                plane_padded, bs_map, q_tables, inv_q_tables,
+                in_scale, in_offset, out_scale, out_offset, lo, hi, integer_out,
+            )[:h, :w]
+
+        out = np.empty_like(plane_padded)
+
+        if process_plane_nb is not None:
+            process_plane_nb(
+                plane_padded, bs_map,
+                self.dct_matrices.get(4, DCT_MATRIX),
+                q_tables.get(4, _UNUSED_Q_TABLE), inv_q_tables.get(4, _UNUSED_INV_Q_TABLE),
+                self.dct_matrices.get(8, DCT_MATRIX),
+                q_tables.get(8, _UNUSED_Q_TABLE), inv_q_tables.get(8, _UNUSED_INV_Q_TABLE),
+                self.dct_matrices.get(16, DCT_MATRIX),
+                q_tables.get(16, _UNUSED_Q_TABLE), inv_q_tables.get(16, _UNUSED_INV_Q_TABLE),
+                out, in_scale, in_offset, out_scale, out_offset, lo, hi, integer_out,
+            )
+            return out[:h, :w]
+
+        centered = plane_padded * np.float32(in_scale) + np.float32(in_offset)
+        mbs = macro_block_size
+        src_macro = centered.reshape(nby, mbs, nbx, mbs).transpose(0, 2, 1, 3)
+        out_macro = out.reshape(nby, mbs, nbx, mbs).transpose(0, 2, 1, 3)
+
+        # group macroblocks by chosen transform size: one gather, one batched
+        # matmul chain over all blocks of that size, one scatter
+        for bs, dct in self.dct_matrices.items():
+            ys, xs = np.nonzero(bs_map == bs)
+            if ys.size == 0:
+                continue
+
+            sub = src_macro[ys, xs]
+            nt = mbs // bs
+            tiles = sub.reshape(-1, nt, bs, nt, bs).transpose(0, 1, 3, 2, 4).reshape(-1, bs, bs)
+            dct_tiles = np.einsum('ij,ajk,lk->ail', dct, tiles, dct)
+            quant_tiles = np.round(dct_tiles * inv_q_tables[bs])
+            idct_tiles = np.einsum('ji,ajk,kl->ail', dct, quant_tiles * q_tables[bs], dct)
+
+            out_macro[ys, xs] = idct_tiles.reshape(-1, nt, nt, bs, bs) \
+                .transpose(0, 1, 3, 2, 4).reshape(-1, mbs, mbs)
+
+        out += 128.0
+        out *= np.float32(out_scale)
+        out += np.float32(out_offset)
+        np.clip(out, lo, hi, out=out)
+        if integer_out:
+            np.rint(out, out=out)
+        return out[:h, :w]
+
+    def _process_plane_gpu(
+        self, plane_padded, bs_map, q_tables, inv_q_tables,
+        in_scale, in_offset, out_scale, out_offset, lo, hi, integer_out,
+    ) -> np.ndarray:
+        """Same batched pipeline as the CPU fallback, run as cuBLAS batched GEMMs."""
+        ph, pw = plane_padded.shape
+        macro_block_size = self._macro_block_size
+
+        centered = cp.asarray(plane_padded) * cp.float32(in_scale) + cp.float32(in_offset)
+        out = cp.zeros_like(centered)
+
+        for bs in self.dct_matrices:
+            region = bs_map == bs
+            if not region.any():
+                continue
+            region = cp.asarray(np.repeat(np.repeat(region, macro_block_size, axis=0), macro_block_size, axis=1))
+
+            dct = self._to_gpu(self.dct_matrices[bs])
+            q_table = self._to_gpu(q_tables[bs])
+            inv_q = self._to_gpu(inv_q_tables[bs])
+
+            tiles = centered.reshape(ph // bs, bs, pw // bs, bs).transpose(0, 2, 1, 3)
+            dct_tiles = cp.einsum('ij,abjk,lk->abil', dct, tiles, dct)
+            dequant_tiles = _gpu_quant(dct_tiles, q_table, inv_q)
+            idct_tiles = cp.einsum('ji,abjk,kl->abil', dct, dequant_tiles, dct)
+            reconstructed = idct_tiles.transpose(0, 2, 1, 3).reshape(ph, pw)
+
+            out = cp.where(region, reconstructed, out)
+
+        out = cp.clip((out + 128.0) * cp.float32(out_scale) + cp.float32(out_offset), lo, hi)
+        if integer_out:
+            out = cp.rint(out)
+        return cp.asnumpy(out)
+
+    def _plane_mask(
+        self, main_frame: vs.VideoFrame, mask_frame: vs.VideoFrame | None, plane_index: int
+    ) -> np.ndarray | None:
+        """The mask frame, normalized to [0, 1] and subsampled to the plane's grid."""
+        if mask_frame is None:
+            return None
+
+        mask_plane = np.asarray(mask_frame[0]).astype(np.float32)
+        if mask_frame.format.sample_type is vs.INTEGER:
+            mask_plane /= (1 << mask_frame.format.bits_per_sample) - 1
+
+        if plane_index > 0:
+            mask_plane = mask_plane[::1 << main_frame.format.subsampling_h,
+                                    ::1 << main_frame.format.subsampling_w]
+        return mask_plane
+
+    def _plane_int(
+        self, main_frame: vs.VideoFrame, mask_frame: vs.VideoFrame | None, i: int,
+        dst: np.ndarray, scale_factor: float, max_val: int,
+    ) -> None:
+        plane = np.asarray(main_frame[i])
+        luma = i == 0
+        q_tables = self.luma_q_tables if luma else self.chroma_q_tables
+        inv_q_tables = self.inv_luma_q_tables if luma else self.inv_chroma_q_tables
+
+        plane_f32 = self._scratch_plane(plane.shape)
+        np.copyto(plane_f32, plane)
+        processed_plane = self._process_plane(
+            plane_f32, q_tables, inv_q_tables, self._plane_mask(main_frame, mask_frame, i),
+            in_scale=1.0 / scale_factor, out_scale=scale_factor,
+            hi=max_val, integer_out=True,
+        )
+        np.copyto(dst, processed_plane, casting="unsafe")
+
+    def _plane_float(
+        self, main_frame: vs.VideoFrame, mask_frame: vs.VideoFrame | None, i: int,
+        dst: np.ndarray,
+    ) -> None:
+        plane = np.asarray(main_frame[i])
+        luma = i == 0
+        q_tables = self.luma_q_tables if luma else self.chroma_q_tables
+        inv_q_tables = self.inv_luma_q_tables if luma else self.inv_chroma_q_tables
+        chroma = main_frame.format.color_family is vs.YUV and i > 0
+        offset = 0.5 if chroma else 0.0
+
+        plane_f32 = self._scratch_plane(plane.shape)
+        np.copyto(plane_f32, plane)
+        processed_plane = self._process_plane(
+            plane_f32, q_tables, inv_q_tables, self._plane_mask(main_frame, mask_frame, i),
+            in_scale=255.0, in_offset=offset * 255.0 - 128.0,
+            out_scale=1.0 / 255.0, out_offset=-offset,
+            lo=0.0 - offset, hi=1.0 - offset,
+        )
+        np.copyto(dst, processed_plane)
+
+    def _process_frame_int(self, n: int, f: vs.VideoFrame | list[vs.VideoFrame]) -> vs.VideoFrame:
+        main_frame, mask_frame = (f, None) if isinstance(f, vs.VideoFrame) else f
+        fout = main_frame.copy()
+
+        max_val = (1 << main_frame.format.bits_per_sample) - 1
+        scale_factor = max_val / 255.0
+
+        futures = [
+            self._pool.submit(self._plane_int, main_frame, mask_frame, i, np.asarray(fout[i]),
+                              scale_factor, max_val)
+            for i in range(fout.format.num_planes)
+        ]
+        for future in futures:
+            future.result()
+
+        return fout
+
+    def _process_frame_float(self, n: int, f: vs.VideoFrame | list[vs.VideoFrame]) -> vs.VideoFrame:
+        main_frame, mask_frame = (f, None) if isinstance(f, vs.VideoFrame) else f
+        fout = main_frame.copy()
+
+        futures = [
+            self._pool.submit(self._plane_float, main_frame, mask_frame, i, np.asarray(fout[i]))
+            for i in range(fout.format.num_planes)
+        ]
+        for future in futures:
+            future.result()
+
+        return fout
+
+    def apply(self, clip: vs.VideoNode, use_motion_mask: bool = True) -> vs.VideoNode:
+        if clip.format.sample_type is vs.FLOAT:
+            selector = self._process_frame_float
+        else:
+            selector = self._process_frame_int
+
+        if use_motion_mask:
+            mask = self._motion_mask(clip)
+            return clip.std.ModifyFrame(clips=[clip, mask], selector=selector)
+
+        return clip.std.ModifyFrame(clips=clip, selector=selector)
@@ -1,183 +1,366 @@
-import vapoursynth as vs
-core = vs.core
-import numpy as np
-
-class NumpyToVideoNode:
-    def __init__(self, width: int, height: int, length: int, format: vs.PresetVideoFormat = vs.GRAYS):
-        self.width = width
-        self.height = height
-        self.length = length
-        self.format = format
-        
-        self.planes = 1 if self.format is vs.GRAYS else 3 
-        self.clip = vs.core.std.BlankClip(
-            width=width,
-            height=height,
-            format=self.format,
-            color=[0] * self.planes,
-            length=length
-        )
-        
-    def _process_frame(self, n: int, f: vs.VideoNode) -> vs.VideoFrame:
-        fout = f.copy()
-        
-        ramp = self._generate(n)
-        
-        if fout.format.num_planes == 1:
-            np.copyto(np.asarray(fout[0]), ramp)
-        else:
-            for i in range(fout.format.num_planes):
-                np.copyto(np.asarray(fout[i]), ramp[..., i])
-
-        return fout
-
-    def _generate(self, n: int) -> np.ndarray:
-        raise NotImplementedError("subclass broken")
-    
-    def generate(self) -> vs.VideoNode:
-        processed_clip = self.clip.std.ModifyFrame(
-            clips=self.clip,
-            selector=self._process_frame
-            )
-
-        return processed_clip
-
-class HorizontalRamp(NumpyToVideoNode):
-    def _generate(self, n: int) -> np.ndarray:
-        ramp = np.linspace(0, 1, self.width)
-        ramp = np.tile(ramp, (self.height, 1))
-        ramp *= n / (self.length - 1)
-        return ramp
-
-class VerticalRamp(NumpyToVideoNode):
-    def _generate(self, n: int) -> np.ndarray:
-        ramp = np.linspace(0, 1, self.height)
-        ramp = np.repeat(ramp, self.width).reshape(self.height, self.width)
-        ramp *= n / (self.length - 1)
-        return ramp
-
-class CornerRamp(NumpyToVideoNode):
-    def _generate(self, n: int) -> np.ndarray:
-        x = np.linspace(0, 1, self.width)
-        y = np.linspace(0, 1, self.height)
-        xx, yy = np.meshgrid(x, y)
-        ramp = xx * yy
-        ramp *= n / (self.length - 1)
-        return ramp
-
-class CircularRamp(NumpyToVideoNode):
-    def _generate(self, n: int) -> np.ndarray:
-        x = np.linspace(-1, 1, self.width)
-        y = np.linspace(-1, 1, self.height)
-        xx, yy = np.meshgrid(x, y)
-        ramp = np.sqrt(xx**2 + yy**2)
-        ramp = (ramp - np.min(ramp)) / (np.max(ramp) - np.min(ramp))
-        ramp *= n / (self.length - 1)
-        return ramp
-
-class Spiral(NumpyToVideoNode):
-    def _generate(self, n: int) -> np.ndarray:
-        x = np.linspace(-10, 10, self.width)
-        y = np.linspace(-10, 10, self.height)
-
-        xx, yy = np.meshgrid(x, y)
-
-        r = np.sqrt(xx ** 2 + yy ** 2)
-
-        spiral = np.sin(r - n)
-        
-        return spiral
-
-class Checkerboard(NumpyToVideoNode):
-    def _generate(self, n: int) -> np.ndarray:
-        pattern = np.zeros((self.height, self.width))
-        pattern[::2, ::2] = 1
-        pattern[1::2, 1::2] = 1
-        
-        return pattern
-
-class Diamond(NumpyToVideoNode):
-    def _generate(self, n: int) -> np.ndarray:
-        x = np.linspace(-1, 1, self.width)
-        y = np.linspace(-1, 1, self.height)
-        xx, yy = np.meshgrid(x, y)
-        
-        gradient = 1 - np.abs(xx) - np.abs(yy)
-        gradient = np.clip(gradient, 0, 1)
-        gradient *= n / (self.length - 1)
-        
-        return gradient
-
-class RotatingBandingGradients(NumpyToVideoNode):
-    def __init__(self, width: int, height: int, length: int):
-        super().__init__(width, height, length, format=vs.RGBS)
-
-    def _generate(self, n: int, format=vs.RGBS) -> np.ndarray:
-        x = np.linspace(-1, 1, self.width)
-        y = np.linspace(-1, 1, self.height)
-
-        xx, yy = np.meshgrid(x, y)
-
-        angle = n * np.pi / 180
-
-        num_frames = 240
-        peak_n = num_frames / 10
-        peak_frame = num_frames // 2
-
-        angle = n * np.pi / 180
-        
-        if n < peak_frame:
-            n = peak_n * n / peak_frame
-        else:
-            n = peak_n * (num_frames - n) / (num_frames - peak_frame)
-        
-        c = n / 10
-
-        colors = np.array([
-            [1, 0, 0],
-            [0, 1, 0],
-            [0, 0, 1],
-            [1, 1, 1]
-        ])
-
-        angle_array = angle + np.array([0, np.pi / 2, np.pi, 3 * np.pi / 2])
-
-        center_x = c / 3 * np.sin(angle_array)
-        center_y = c / 3 * np.cos(angle_array)
-
-        radius = np.sqrt((xx[:, :, np.newaxis] - center_x)**2 + (yy[:, :, np.newaxis] - center_y)**2)
-        
-        gradient = np.exp(-n * radius**2)
-        
-        rgb_gradient = gradient[:, :, :, np.newaxis] * colors
-        
-        rgb_gradient = np.sum(rgb_gradient, axis=2)
-
-        rgb_gradient = (rgb_gradient - np.min(rgb_gradient)) / (np.max(rgb_gradient) - np.min(rgb_gradient) + 1e-8)
-        
-        return rgb_gradient
-
-class Vortex(NumpyToVideoNode):
-    def __init__(self, width: int, height: int, length: int):
-        super().__init__(width, height, length, format=vs.RGBS)
-    
-    def _generate(self, n: int) -> np.ndarray:
-        x = np.linspace(-1, 1, self.width)
-        y = np.linspace(-1, 1, self.height)
-        xx, yy = np.meshgrid(x, y)
-        
-        angle = np.arctan2(yy, xx)
-        radius = np.sqrt(xx**2 + yy**2)
-        
-        vortex_r = np.sin(angle * 5 + radius * 10 - n / 10)
-        vortex_g = np.sin(angle * 5 + radius * 10 - n / 10 + 2 * np.pi / 3)
-        vortex_b = np.sin(angle * 5 + radius * 10 - n / 10 + 4 * np.pi / 3)
-        
-        vortex = np.stack((vortex_r, vortex_g, vortex_b), axis=-1)
-        vortex = (vortex + 1) / 2
-        vortex *= n / (self.length - 1)
-        
-        mask = np.exp(-radius**2 * 5)
-        vortex *= mask[..., np.newaxis]
-
-        return vortex
+from functools import cached_property, lru_cache
+
+import vapoursynth as vs
+core = vs.core
+import numpy as np
+
+try:
+    import cupy as cp
+except ImportError:
+    cp = None
+
+try:
+    import numexpr as ne
+except ImportError:
+    ne = None
+
+from ._gradient_kernels import banding_nb, circular_nb, spiral_nb, vortex_nb
+
+@lru_cache(maxsize=64)
+def _linspace(lo: float, hi: float, num: int) -> np.ndarray:
+    # the coordinate vectors are shared across generator instances; marked
+    # read-only so no caller can mutate a cached copy under another
+    arr = np.linspace(lo, hi, num, dtype=np.float32)
+    arr.flags.writeable = False
+    return arr
+
+class NumpyToVideoNode:
+    def __init__(self, width: int, height: int, length: int, format: vs.PresetVideoFormat = vs.GRAYS,
+                 use_gpu: bool | None = None):
+        self.width = width
+        self.height = height
+        self.length = length
+        self.format = format
+        # same auto-detection as the artifacts generators
+        self.use_gpu = cp is not None and cp.cuda.is_available() if use_gpu is None else use_gpu
+
+        self.planes = 1 if self.format is vs.GRAYS else 3
+        self.clip = vs.core.std.BlankClip(
+            width=width,
+            height=height,
+            format=self.format,
+            color=[0] * self.planes,
+            length=length
+        )
+
+    # the geometry never changes between frames, so build it once on first
+    # use and let _generate do only the per-frame scalar math; the grids are
+    # broadcastable (1, W) / (H, 1) vectors rather than materialized planes
+    @cached_property
+    def _grid01(self) -> tuple[np.ndarray, np.ndarray]:
+        return (
+            _linspace(0, 1, self.width)[None, :],
+            _linspace(0, 1, self.height)[:, None],
+        )
+
+    @cached_property
+    def _grid_sym(self) -> tuple[np.ndarray, np.ndarray]:
+        return (
+            _linspace(-1, 1, self.width)[None, :],
+            _linspace(-1, 1, self.height)[:, None],
+        )
+
+    @cached_property
+    def _radius_sym(self) -> np.ndarray:
+        xx, yy = self._grid_sym
+        return np.sqrt(xx**2 + yy**2)
+
+    @cached_property
+    def _angle_sym(self) -> np.ndarray:
+        xx, yy = self._grid_sym
+        return np.arctan2(yy, xx)
+
+    @cached_property
+    def _frame_scale(self) -> np.ndarray:
+        # n / (length - 1) for every frame, computed once up front
+        return np.arange(self.length, dtype=np.float32) / max(1, self.length - 1)
+
+    def _process_frame(self, n: int, f: vs.VideoNode) -> vs.VideoFrame:
+        fout = f.copy()
+
+        # the plane views are writable, so _generate fills them directly
+        # instead of staging a full frame and copying it over
+        if self.planes == 1:
+            self._generate(n, np.asarray(fout[0]))
+        else:
+            self._generate(n, [np.asarray(fout[i]) for i in range(self.planes)])
+
+        return fout
+
+    def _generate(self, n: int, out: np.ndarray | list[np.ndarray]) -> None:
+        raise NotImplementedError("subclass broken")
+    
+    def generate(self) -> vs.VideoNode:
+        processed_clip = self.clip.std.ModifyFrame(
+            clips=self.clip,
+            selector=self._process_frame
+            )
+
+        return processed_clip
+
+class HorizontalRamp(NumpyToVideoNode):
+    # the ramp only varies along one axis, so cache it as a 1-D vector and
+    # let broadcasting fill the other axis during the output write
+    @cached_property
+    def _ramp(self) -> np.ndarray:
+        return _linspace(0, 1, self.width)
+
+    def _generate(self, n: int, out: np.ndarray) -> None:
+        np.multiply(self._ramp[None, :], self._frame_scale[n], out=out)
+
+class VerticalRamp(NumpyToVideoNode):
+    @cached_property
+    def _ramp(self) -> np.ndarray:
+        return _linspace(0, 1, self.height)
+
+    def _generate(self, n: int, out: np.ndarray) -> None:
+        np.multiply(self._ramp[:, None], self._frame_scale[n], out=out)
+
+class CornerRamp(NumpyToVideoNode):
+    def _generate(self, n: int, out: np.ndarray) -> None:
+        xx, yy = self._grid01
+        np.multiply(xx, yy, out=out)
+        out *= self._frame_scale[n]
+
+class CircularRamp(NumpyToVideoNode):
+    # the min/max of the radius only depend on the geometry, so normalize
+    # once and leave only the per-frame scalar multiply
+    @cached_property
+    def _radius_norm(self) -> np.ndarray:
+        r = self._radius_sym
+        return ((r - np.min(r)) / (np.max(r) - np.min(r))).astype(np.float32)
+
+    def _generate(self, n: int, out: np.ndarray) -> None:
+        scale = self._frame_scale[n]
+        if circular_nb is not None:
+            circular_nb(self._radius_norm, np.float32(0.0), scale, out)
+            return
+        np.multiply(self._radius_norm, scale, out=out)
+
+class Spiral(NumpyToVideoNode):
+    _LUT_SIZE = 4096
+
+    @cached_property
+    def _radius(self) -> np.ndarray:
+        xx = _linspace(-10, 10, self.width)[None, :]
+        yy = _linspace(-10, 10, self.height)[:, None]
+        return np.sqrt(xx ** 2 + yy ** 2)
+
+    @cached_property
+    def _sin_lut(self) -> np.ndarray:
+        return np.sin(np.linspace(0, 2 * np.pi, self._LUT_SIZE, endpoint=False, dtype=np.float32))
+
+    @cached_property
+    def _phase_idx(self) -> np.ndarray:
+        # radius pre-scaled to table index units
+        return self._radius * np.float32(self._LUT_SIZE / (2 * np.pi))
+
+    def _generate(self, n: int, out: np.ndarray) -> None:
+        if spiral_nb is not None:
+            spiral_nb(self._radius, np.float32(n), out)
+            return
+        # integer gather from the sine table instead of a libm sin pass
+        idx = (self._phase_idx - np.float32(n * self._LUT_SIZE / (2 * np.pi))).astype(np.int32)
+        idx &= self._LUT_SIZE - 1
+        np.take(self._sin_lut, idx, out=out)
+
+class Checkerboard(NumpyToVideoNode):
+    @cached_property
+    def _pattern(self) -> np.ndarray:
+        pattern = np.zeros((self.height, self.width), dtype=np.float32)
+        pattern[::2, ::2] = 1
+        pattern[1::2, 1::2] = 1
+        return pattern
+
+    def _generate(self, n: int, out: np.ndarray) -> None:
+        np.copyto(out, self._pattern)
+
+    def generate(self) -> vs.VideoNode:
+        # the pattern never changes across n, so render one frame and loop it
+        frame = self.clip[0].std.ModifyFrame(clips=self.clip[0], selector=self._process_frame)
+        return core.std.Loop(frame, self.length)
+
+class Diamond(NumpyToVideoNode):
+    def _generate(self, n: int, out: np.ndarray) -> None:
+        xx, yy = self._grid_sym
+
+        np.add(np.abs(xx), np.abs(yy), out=out)
+        np.subtract(1, out, out=out)
+        np.clip(out, 0, 1, out=out)
+        out *= self._frame_scale[n]
+
+class RotatingBandingGradients(NumpyToVideoNode):
+    def __init__(self, width: int, height: int, length: int, use_gpu: bool | None = None):
+        super().__init__(width, height, length, format=vs.RGBS, use_gpu=use_gpu)
+        self._colors = np.array([
+            [1, 0, 0],
+            [0, 1, 0],
+            [0, 0, 1],
+            [1, 1, 1]
+        ], dtype=np.float32)
+
+    @cached_property
+    def _scratch(self) -> np.ndarray:
+        return np.empty((self.height, self.width), dtype=np.float32)
+
+    @cached_property
+    def _grid_gpu(self):
+        xx, yy = self._grid_sym
+        return cp.asarray(xx), cp.asarray(yy)
+
+    def _generate(self, n: int, out: list[np.ndarray]) -> None:
+        xx, yy = self._grid_sym
+
+        angle = n * np.pi / 180
+
+        num_frames = 240
+        peak_n = num_frames / 10
+        peak_frame = num_frames // 2
+
+        if n < peak_frame:
+            n = peak_n * n / peak_frame
+        else:
+            n = peak_n * (num_frames - n) / (num_frames - peak_frame)
+        
+        c = n / 10
+
+        colors = self._colors
+
+        # the four phase offsets are 0, pi/2, pi, 3pi/2, so the centers are
+        # just sign/axis permutations of one sin/cos pair
+        sin_a = np.sin(angle)
+        cos_a = np.cos(angle)
+        amp = np.float32(c / 3)
+        center_x = amp * np.array([sin_a, cos_a, -sin_a, -cos_a], dtype=np.float32)
+        center_y = amp * np.array([cos_a, -sin_a, -cos_a, sin_a], dtype=np.float32)
+
+        if self.use_gpu:
+            xg, yg = self._grid_gpu
+            acc = [cp.zeros((self.height, self.width), dtype=cp.float32) for _ in range(3)]
+            for i in range(len(colors)):
+                dx = xg - np.float32(center_x[i])
+                dy = yg - np.float32(center_y[i])
+                gauss = cp.exp(np.float32(-n) * (dx * dx + dy * dy))
+                for ch in range(3):
+                    if colors[i, ch]:
+                        acc[ch] += gauss
+            lo = np.float32(min(float(a.min()) for a in acc))
+            inv = np.float32(1.0 / (max(float(a.max()) for a in acc) - lo + 1e-8))
+            for ch in range(3):
+                acc[ch] -= lo
+                acc[ch] *= inv
+                out[ch][...] = cp.asnumpy(acc[ch])
+            return
+
+        if banding_nb is not None:
+            banding_nb(
+                xx[0], yy[:, 0],
+                center_x.astype(np.float32), center_y.astype(np.float32),
+                colors, np.float32(n), out[0], out[1], out[2],
+            )
+        else:
+            # accumulate the four gaussians one at a time, straight into the
+            # output planes; the broadcast version materialized (h, w, 4) and
+            # (h, w, 4, 3) temporaries per frame
+            for plane in out:
+                plane.fill(0.0)
+            scratch = self._scratch
+            for i in range(len(colors)):
+                if ne is not None:
+                    # one blocked pass per gaussian, no full-plane temporaries
+                    ne.evaluate(
+                        "exp(-n_f * ((xx - cx) * (xx - cx) + (yy - cy) * (yy - cy)))",
+                        local_dict=dict(
+                            xx=xx, yy=yy,
+                            cx=np.float32(center_x[i]), cy=np.float32(center_y[i]),
+                            n_f=np.float32(n),
+                        ),
+                        out=scratch,
+                    )
+                else:
+                    dx = xx - np.float32(center_x[i])
+                    dx *= dx
+                    dy = yy - np.float32(center_y[i])
+                    dy *= dy
+                    np.add(dx, dy, out=scratch)
+                    scratch *= np.float32(-n)
+                    np.exp(scratch, out=scratch)
+                for ch in range(3):
+                    if colors[i, ch]:
+                        out[ch] += scratch
+
+        # for small gaussian widths (the fade-in/out at either end of the
+        # clip) the far-field minimum is nowhere near zero, so the full
+        # min/max normalization is load-bearing; the reductions and the
+        # subtract/multiply stay in place over the output planes
+        lo = np.float32(min(float(plane.min()) for plane in out))
+        inv = np.float32(1.0 / (max(float(plane.max()) for plane in out) - lo + 1e-8))
+        for plane in out:
+            plane -= lo
+            plane *= inv
+
+class Vortex(NumpyToVideoNode):
+    def __init__(self, width: int, height: int, length: int, use_gpu: bool | None = None):
+        super().__init__(width, height, length, format=vs.RGBS, use_gpu=use_gpu)
+
+    @cached_property
+    def _polar_gpu(self):
+        return cp.asarray(self._angle_sym), cp.asarray(self._radius_sym)
+
+    def _generate(self, n: int, out: list[np.ndarray]) -> None:
+        angle = self._angle_sym
+        radius = self._radius_sym
+
+        scale = 0.5 * self._frame_scale[n]
+
+        if self.use_gpu:
+            angle_g, radius_g = self._polar_gpu
+            phase = angle_g * np.float32(5)
+            phase += radius_g * np.float32(10)
+            phase -= np.float32(n / 10)
+            mask = cp.exp(radius_g * radius_g * np.float32(-5))
+            mask *= np.float32(scale)
+            s = cp.sin(phase)
+            c = cp.cos(phase, out=phase)
+            out[0][...] = cp.asnumpy((s + 1) * mask)
+            s *= np.float32(-0.5)
+            c *= np.float32(np.sqrt(3) / 2)
+            g = s + c
+            g += 1
+            g *= mask
+            out[1][...] = cp.asnumpy(g)
+            s -= c
+            s += 1
+            s *= mask
+            out[2][...] = cp.asnumpy(s)
+            return
+
+        if vortex_nb is not None:
+            vortex_nb(angle, radius, np.float32(n), np.float32(scale), out[0], out[1], out[2])
+            return
+
+        if ne is not None:
+            phase = ne.evaluate(
+                "angle * f5 + radius * f10 - shift",
+                local_dict=dict(angle=angle, radius=radius, f5=np.float32(5), f10=np.float32(10),
+                                shift=np.float32(n / 10)),
+            )
+            mask = ne.evaluate("exp(-radius * radius * f5)", local_dict=dict(radius=radius, f5=np.float32(5)))
+        else:
+            phase = angle * 5 + radius * 10 - n / 10
+            mask = np.exp(-radius**2 * 5)
+        mask *= np.float32(scale)
+
+        # sin(phase + k*2pi/3) = sin*cos(k*2pi/3) + cos*sin(k*2pi/3), so one
+        # sin/cos pair replaces three full sin passes
+        s = np.sin(phase)
+        c = np.cos(phase, out=phase)
+        np.copyto(out[0], s)
+        s *= np.float32(-0.5)
+        c *= np.float32(np.sqrt(3) / 2)
+        np.add(s, c, out=out[1])
+        np.subtract(s, c, out=out[2])
+
+        for plane in out:
+            plane += 1
+            plane *= mask